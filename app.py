@@ -1,7 +1,17 @@
-from dash import Dash, html
-import dash 
-app = Dash(__name__, use_pages=True)
+from startup_profile import profiler
+profiler.install_import_timer()
 
+with profiler.stage("import dash"):
+    from dash import Dash, html
+    import dash 
+
+from memory_report import register_diagnostics_routes
+
+with profiler.stage("register pages"):
+    app = Dash(__name__, use_pages=True)
+
+
+register_diagnostics_routes(app.server)
 
 app.layout = html.Div(
     children=[
@@ -9,5 +19,8 @@ app.layout = html.Div(
     ]
 )
 
+profiler.report()
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    # The reloader would start (and profile) everything a second time
+    app.run(debug=True, use_reloader=not profiler.enabled)
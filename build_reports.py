@@ -0,0 +1,139 @@
+"""
+Render every team dashboard and the injury heatmap to static files.
+
+    python build_reports.py --output reports --workers 4
+
+Loads the same data as the Teams page (without starting the server) and
+spreads the team x mode renders across a process pool.
+"""
+import argparse
+import html as html_escape
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+from plotly.utils import PlotlyJSONEncoder
+
+
+MODES = ["defense", "attack"]
+# Written once next to the pages so they open offline with the plotly.js that matches the figures
+PLOTLY_JS_FILE = "plotly.min.js"
+
+
+def load_teams_page():
+    """Import the Teams page once per process; forked workers inherit it."""
+    if "pages.teams" not in sys.modules:
+        import app  # noqa: F401  (building the Dash app registers the pages)
+    return sys.modules["pages.teams"]
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", str(name).lower()).strip("-")
+
+
+def write_page(path, title, body):
+    with open(path, "w") as f:
+        f.write(
+            f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html_escape.escape(title)}</title>"
+            f"<script src='{PLOTLY_JS_FILE}'></script></head><body style='font-family: Arial'>"
+            f"<h2>{html_escape.escape(title)}</h2>{body}</body></html>"
+        )
+
+
+def render_team(task):
+    team, mode, output_dir, formats = task
+    teams_page = load_teams_page()
+
+    fig, status, congestion, summary, _ = teams_page.update_team_dashboard(team, mode)
+    base = os.path.join(output_dir, f"{slugify(team)}-{mode}")
+
+    if "json" in formats:
+        with open(f"{base}.json", "w") as f:
+            json.dump({
+                "figure": fig,
+                "status": status,
+                "congestion": congestion,
+                "summary": summary,
+            }, f, cls=PlotlyJSONEncoder)
+    if "html" in formats:
+        label = "Defensive" if mode == "defense" else "Attacking"
+        body = (
+            go.Figure(fig).to_html(full_html=False, include_plotlyjs=False) +
+            pd.DataFrame(status).to_html(index=False) +
+            pd.DataFrame(congestion).to_html(index=False) +
+            f"<p>{html_escape.escape(summary)}</p>"
+        )
+        write_page(f"{base}.html", f"{team} {label} Stats", body)
+
+    return team, mode, os.path.basename(base)
+
+
+def render_injury_history(teams_page, output_dir, formats):
+    summary_table, heatmap_fig = teams_page.process_injury_data(
+        teams_page.injury_records(teams_page.DEFAULT_INJURY_SEASON)
+    )
+    if summary_table is None:
+        return None
+
+    base = os.path.join(output_dir, "injury-history")
+    if "json" in formats:
+        with open(f"{base}.json", "w") as f:
+            json.dump({
+                "summary": summary_table.to_dict("records"),
+                "heatmap": json.loads(pio.to_json(heatmap_fig)),
+            }, f)
+    if "html" in formats:
+        body = heatmap_fig.to_html(full_html=False, include_plotlyjs=False) + summary_table.to_html(index=False)
+        write_page(f"{base}.html", "Historic Injuries", body)
+
+    return os.path.basename(base)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build static Team Stats reports.")
+    parser.add_argument("--output", default="reports", help="directory to write the reports to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="size of the process pool")
+    parser.add_argument("--format", choices=["html", "json", "both"], default="both")
+    args = parser.parse_args(argv)
+
+    formats = ["html", "json"] if args.format == "both" else [args.format]
+    os.makedirs(args.output, exist_ok=True)
+    if "html" in formats:
+        with open(os.path.join(args.output, PLOTLY_JS_FILE), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    start = time.perf_counter()
+    teams_page = load_teams_page()
+    print(f"Loaded data in {time.perf_counter() - start:.1f}s")
+
+    tasks = [(team, mode, args.output, formats) for team in teams_page.team_results["team"] for mode in MODES]
+
+    # Fork lets workers reuse the already-loaded data instead of fetching it again
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context, initializer=load_teams_page) as pool:
+        rendered = list(pool.map(render_team, tasks))
+        injury_page = render_injury_history(teams_page, args.output, formats)
+
+    links = [
+        f"<li><a href='{base}.html'>{html_escape.escape(team)} ({mode})</a></li>"
+        for team, mode, base in rendered
+    ]
+    if injury_page:
+        links.append(f"<li><a href='{injury_page}.html'>Historic injuries</a></li>")
+    if "html" in formats:
+        write_page(os.path.join(args.output, "index.html"), "Match-day Reports", f"<ul>{''.join(links)}</ul>")
+
+    print(f"Rendered {len(rendered)} dashboards to {args.output}/ in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
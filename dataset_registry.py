@@ -0,0 +1,130 @@
+import atexit
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import pandas as pd
+
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+SPILL_DIR = ".dataset-cache"
+# Spill directories left behind by crashed or killed processes are removed after this
+SPILL_TTL_SECONDS = 24 * 60 * 60
+
+
+class Dataset:
+    """A set of frames for one (source, league, season)."""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def memory_bytes(self):
+        return int(sum(df.memory_usage(deep=True).sum() for df in self.frames.values()))
+
+
+class DatasetRegistry:
+    """
+    Loads datasets on demand, keyed by (source, league, season).
+
+    Resident datasets are kept in least-recently-used order and counted
+    against `memory_budget_mb`; when the budget is exceeded the oldest ones
+    are spilled to `spill_dir` and reloaded from there on the next request
+    instead of hitting the API again.
+
+    Spills belong to one registry in one process. Each gets its own
+    subdirectory, so a restart never reads data spilled before it.
+    """
+
+    def __init__(self, memory_budget_mb=None, spill_dir=SPILL_DIR):
+        if memory_budget_mb is None:
+            memory_budget_mb = float(os.getenv("DATASET_MEMORY_MB", DEFAULT_MEMORY_BUDGET_MB))
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.spill_dir = spill_dir
+        self.run_id = uuid.uuid4().hex[:12]
+        self.loaders = {}
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self._lock = threading.RLock()
+
+        self._clear_stale_spills()
+        atexit.register(self._clear_own_spills)
+
+    def _process_spill_dir(self):
+        # Forked workers inherit the registry, so the pid is part of the name too
+        return os.path.join(self.spill_dir, f"{self.run_id}-{os.getpid()}")
+
+    def _clear_own_spills(self):
+        shutil.rmtree(self._process_spill_dir(), ignore_errors=True)
+
+    def _clear_stale_spills(self):
+        if not os.path.isdir(self.spill_dir):
+            return
+        cutoff = time.time() - SPILL_TTL_SECONDS
+        for name in os.listdir(self.spill_dir):
+            path = os.path.join(self.spill_dir, name)
+            try:
+                if not os.path.isdir(path):
+                    # Flat spill files from before spills were kept per process
+                    os.remove(path)
+                elif os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError as e:
+                print(f"Error removing stale spill {path}: {e}")
+
+    def register_source(self, source, loader):
+        """`loader(league, season)` must return a Dataset."""
+        self.loaders[source] = loader
+
+    def _spill_path(self, key):
+        source, league, season = key
+        return os.path.join(self._process_spill_dir(), f"{source}-{league}-{season}.pkl")
+
+    def get(self, source, league, season):
+        key = (source, league, season)
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+            dataset = None
+            spill_path = self._spill_path(key)
+            if os.path.exists(spill_path):
+                try:
+                    dataset = pd.read_pickle(spill_path)
+                except Exception as e:
+                    print(f"Error reading spilled {key}: {e}")
+            if dataset is None:
+                dataset = self.loaders[source](league, season)
+
+            self.entries[key] = dataset
+            self.sizes[key] = dataset.memory_bytes()
+            self._evict()
+            return dataset
+
+    def resident_bytes(self):
+        return sum(self.sizes.values())
+
+    def _evict(self):
+        # Always keep the dataset that was just requested
+        while self.resident_bytes() > self.memory_budget and len(self.entries) > 1:
+            key, dataset = self.entries.popitem(last=False)
+            self.sizes.pop(key)
+
+            spill_path = self._spill_path(key)
+            if os.path.exists(spill_path):
+                continue
+            try:
+                os.makedirs(self._process_spill_dir(), exist_ok=True)
+                pd.to_pickle(dataset, spill_path)
+            except Exception as e:
+                print(f"Error spilling {key} to disk: {e}")
+
+    def summary(self):
+        with self._lock:
+            return [
+                {"source": s, "league": l, "season": y, "bytes": self.sizes[(s, l, y)]}
+                for s, l, y in self.entries
+            ]
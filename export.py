@@ -0,0 +1,77 @@
+import io
+
+from flask import Response, abort, stream_with_context
+
+
+CHUNK_ROWS = 1000
+
+MIMETYPES = {
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def flatten_lists(chunk):
+    """CSV has no list type: join list cells into one string, e.g. ['W', 'D', 'L'] -> 'WDL'."""
+    list_columns = [
+        col for col in chunk.columns
+        if chunk[col].dtype == object and chunk[col].map(lambda v: isinstance(v, (list, tuple))).any()
+    ]
+    if not list_columns:
+        return chunk
+
+    chunk = chunk.copy()
+    for col in list_columns:
+        chunk[col] = chunk[col].map(
+            lambda v: "".join(str(item) for item in v) if isinstance(v, (list, tuple)) else v
+        )
+    return chunk
+
+
+def stream_csv(df, chunk_rows=CHUNK_ROWS):
+    """Yield the frame as CSV text, one slice of rows at a time."""
+    if df.empty:
+        yield df.to_csv(index=False)
+        return
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = flatten_lists(df.iloc[start:start + chunk_rows])
+        yield chunk.to_csv(index=False, header=start == 0)
+
+
+def stream_arrow(df, chunk_rows=CHUNK_ROWS):
+    """Yield the frame as an Arrow IPC stream, one record batch per slice."""
+    import pyarrow as pa
+
+    # Infer the schema once so an all-null slice can't change a column's type
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for start in range(0, len(df), chunk_rows):
+            batch = pa.RecordBatch.from_pandas(
+                df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False
+            )
+            writer.write_batch(batch)
+
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate(0)
+
+    # End-of-stream marker written on close
+    yield sink.getvalue()
+
+
+def export_response(df, fmt, name):
+    if fmt == "csv":
+        body = stream_csv(df)
+    elif fmt == "arrow":
+        body = stream_arrow(df)
+    else:
+        abort(404)
+
+    return Response(
+        stream_with_context(body),
+        mimetype=MIMETYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={name}.{fmt}"},
+    )
@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+
+def utc_now():
+    return pd.Timestamp.now(tz="UTC").tz_localize(None)
+
+
+class FixtureIndex:
+    """
+    Per-team fixture lists built once per fixtures snapshot.
+
+    Each team keeps its home/away row positions and its scheduled fixtures
+    sorted by kickoff, so "next N" and date-range queries are a binary
+    search instead of a boolean scan over every fixture.
+    """
+
+    def __init__(self, fixtures_df):
+        self.fixtures = fixtures_df.reset_index(drop=True)
+
+        # Naive UTC so the kickoffs can be searched with numpy
+        kickoffs = pd.to_datetime(self.fixtures["kickoff_time"], utc=True).dt.tz_localize(None)
+        kickoff_values = kickoffs.to_numpy()
+        scheduled = kickoffs.notna().to_numpy()
+
+        home = defaultdict(list)
+        away = defaultdict(list)
+        for pos, (team_h, team_a) in enumerate(zip(self.fixtures["team_h"], self.fixtures["team_a"])):
+            home[team_h].append(pos)
+            away[team_a].append(pos)
+
+        self.home_positions = {team: np.array(p) for team, p in home.items()}
+        self.away_positions = {team: np.array(p) for team, p in away.items()}
+        self.positions = {}
+        self.kickoffs = {}
+        for team in set(home) | set(away):
+            positions = np.array(home[team] + away[team])
+            positions = positions[scheduled[positions]]
+            order = np.argsort(kickoff_values[positions], kind="stable")
+            self.positions[team] = positions[order]
+            self.kickoffs[team] = kickoff_values[positions][order]
+
+    @property
+    def teams(self):
+        return list(self.positions)
+
+    def _rows(self, positions):
+        return self.fixtures.iloc[positions]
+
+    def home(self, team):
+        return self._rows(self.home_positions.get(team, np.array([], dtype=int)))
+
+    def away(self, team):
+        return self._rows(self.away_positions.get(team, np.array([], dtype=int)))
+
+    def team_fixtures(self, team):
+        """Every scheduled fixture for the team, in kickoff order."""
+        return self._rows(self.positions.get(team, np.array([], dtype=int)))
+
+    def next_fixtures(self, team, n, now=None):
+        kickoffs = self.kickoffs.get(team)
+        if kickoffs is None:
+            return self._rows([])
+        start = np.searchsorted(kickoffs, np.datetime64(now or utc_now()), side="right")
+        return self._rows(self.positions[team][start:start + n])
+
+    def fixtures_between(self, team, start, end):
+        """Fixtures with kickoff in [start, end]."""
+        kickoffs = self.kickoffs.get(team)
+        if kickoffs is None:
+            return self._rows([])
+        lo = np.searchsorted(kickoffs, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = np.searchsorted(kickoffs, np.datetime64(pd.Timestamp(end)), side="right")
+        return self._rows(self.positions[team][lo:hi])
+
+    def games_within(self, team, days, now=None):
+        kickoffs = self.kickoffs.get(team)
+        if kickoffs is None:
+            return 0
+        now = np.datetime64(now or utc_now())
+        lo = np.searchsorted(kickoffs, now, side="right")
+        hi = np.searchsorted(kickoffs, now + np.timedelta64(days, "D"), side="right")
+        return int(hi - lo)
+
+    def congestion(self, team, now=None):
+        """Fixture-congestion metrics shown next to the squad status table."""
+        now = np.datetime64(now or utc_now())
+        kickoffs = self.kickoffs.get(team, np.array([], dtype="datetime64[ns]"))
+        following = np.searchsorted(kickoffs, now, side="right")
+        days_to_next = None
+        if following < len(kickoffs):
+            days_to_next = int((kickoffs[following] - now) // np.timedelta64(1, "D"))
+
+        return {
+            "Next 7 Days": self.games_within(team, 7, now),
+            "Next 14 Days": self.games_within(team, 14, now),
+            "Next 28 Days": self.games_within(team, 28, now),
+            "Days to Next Match": days_to_next,
+        }
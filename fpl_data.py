@@ -0,0 +1,132 @@
+import os
+
+import pandas as pd
+import requests
+from dotenv import load_dotenv
+
+from startup_profile import profiler
+
+load_dotenv()
+
+FPL_SEASON = 2025
+REFRESH_SECONDS = 300
+POLL_SECONDS = 60
+# Keep only the derived tables and the columns the pages use
+LEAN_MODE = os.getenv("LEAN_MODE") == "1"
+
+
+class APIProcessor:
+    def __init__(self):
+        self.current_player_info = None
+        self.total_players = 594
+
+    def fetch(self, url):
+        with profiler.stage(f"GET {profiler.endpoint(url)}"):
+            response = requests.get(url)
+        profiler.record_download(url, len(response.content))
+        return response.json()
+
+    def get_general_information(self):
+        """Loads player list, teams, and position info."""
+        url = "https://fantasy.premierleague.com/api/bootstrap-static/"
+        plf = self.fetch(url)
+
+        current_team_info = plf['teams']
+        self.current_player_info = plf['elements']
+        position_info = plf['element_types']
+
+        return self.current_player_info, current_team_info, position_info
+
+    def get_fixtures(self, team_info):
+        """team_info is the 'teams' list from bootstrap-static for the same season."""
+        url = "https://fantasy.premierleague.com/api/fixtures/"
+        fixture_data = self.fetch(url)
+
+        team_dict = {str(team["id"]): team["name"] for team in team_info}
+
+        for game in fixture_data:
+            if game["event"] is not None:
+                game["event"] = f"Gameweek {game['event']}"
+
+            game["team_a"] = team_dict.get(str(game["team_a"]), game["team_a"])
+            game["team_h"] = team_dict.get(str(game["team_h"]), game["team_h"])
+
+        return fixture_data
+
+    def get_gameweek_live_data(self):
+        gameweeks_data = {}
+        for i in range(39):
+            url = f"https://fantasy.premierleague.com/api/event/{i}/live/"
+            response = self.fetch(url)
+            gameweeks_data[f"Gameweek {i}"] = response
+        return gameweeks_data
+
+
+class InjuryReports:
+    def __init__(self):
+        api = APIProcessor()
+
+        print("Fetching FPL data...")
+        self.current_players_info, self.current_teams_info, self.position_info = api.get_general_information()
+        self.fixture_data = api.get_fixtures(self.current_teams_info)
+        # No page reads the live gameweek payloads; lean mode skips the 39 requests
+        self.current_gameweek_data = None if LEAN_MODE else api.get_gameweek_live_data()
+        print("Completed Loading FPL Data")
+
+    def to_df(self, data):
+        if isinstance(data, pd.DataFrame):
+            return data
+        with profiler.stage("json_normalize"):
+            return pd.json_normalize(data)
+
+    def release_raw_data(self):
+        """Drop the raw API payloads once the derived tables have been built."""
+        self.current_players_info = None
+        self.current_teams_info = None
+        self.position_info = None
+        self.fixture_data = None
+        self.current_gameweek_data = None
+
+
+mapping = {
+    'a': 'Available',
+    'i': 'Injured',
+    'd': 'Doubtful'
+}
+
+
+def build_filtered_players(players_report, team_report, position_report, features):
+    """One row per player with a known status, keeping only `features`."""
+    injury_reports_filtered = players_report[players_report["status"] != "u"].copy()
+    injury_reports_filtered['status'] = injury_reports_filtered['status'].map(mapping)
+
+    filtered_players = injury_reports_filtered[features].copy()
+
+    # Map team IDs → team names
+    team_map = team_report.set_index("id")["name"].to_dict()
+    filtered_players["team"] = filtered_players["team"].map(team_map)
+
+    # Map position IDs → position name
+    pos_map = position_report.set_index("id")["singular_name_short"].to_dict()
+    filtered_players.rename(columns={"element_type": "position"}, inplace=True)
+    filtered_players["position"] = filtered_players["position"].map(pos_map)
+
+    # Convert birth_date → age
+    filtered_players.rename(columns={"birth_date": "age"}, inplace=True)
+    filtered_players = filtered_players.dropna(subset=["age"])
+    filtered_players["age"] = filtered_players["age"].apply(
+        lambda x: FPL_SEASON - int(x.split("-")[0])
+    )
+
+    return filtered_players
+
+
+def load_filtered_players(features):
+    """Re-fetch only bootstrap-static; fixtures and live gameweeks are not needed for a refresh."""
+    players_info, teams_info, position_info = APIProcessor().get_general_information()
+    return build_filtered_players(
+        pd.json_normalize(players_info),
+        pd.json_normalize(teams_info),
+        pd.json_normalize(position_info),
+        features,
+    )
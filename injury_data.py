@@ -0,0 +1,115 @@
+import json
+import os
+
+import pandas as pd
+import requests
+
+from dataset_registry import Dataset, DatasetRegistry
+from fpl_data import LEAN_MODE
+from startup_profile import profiler
+
+API_KEY = os.getenv("API_KEY")
+
+DEFAULT_INJURY_LEAGUE = 39
+DEFAULT_INJURY_SEASON = 2021
+INJURY_SEASONS = [2021, 2022, 2023, 2024]
+
+
+def injury_cache_file(league, season):
+    # The bundled snapshot keeps its original name
+    if (league, season) == (DEFAULT_INJURY_LEAGUE, DEFAULT_INJURY_SEASON):
+        return "saved-output.json"
+    return f"saved-output-{league}-{season}.json"
+
+
+def fetch_injuries(API_KEY, league=None, season=None, team=None, player=None, cache_file="saved-output.json"):
+    api_key = API_KEY
+
+    if not api_key:
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, "r") as f:
+                    data = json.load(f)
+
+                # Don't serve one season's cache for another
+                cached_params = data.get("parameters", {}) if isinstance(data, dict) else {}
+                if cached_params and (
+                    str(cached_params.get("league")) != str(league) or
+                    str(cached_params.get("season")) != str(season)
+                ):
+                    return pd.DataFrame()
+
+                if isinstance(data, dict) and "response" in data and data["response"]:
+                    return pd.json_normalize(data["response"])
+                elif isinstance(data, list) and data:
+                    return pd.json_normalize(data)
+                else:
+                    return pd.DataFrame()
+            except Exception as e:
+                print(f"Error reading {cache_file}: {e}")
+                return pd.DataFrame()
+        else:
+            print(f"No API key and '{cache_file}' not found. Returning empty DataFrame.")
+            return pd.DataFrame()
+
+    url = "https://v3.football.api-sports.io/injuries"
+
+    params = {}
+    if league is not None:
+        params["league"] = league
+    if season is not None:
+        params["season"] = season
+    if team is not None:
+        params["team"] = team
+    if player is not None:
+        params["player"] = player
+
+    headers = {
+        "x-apisports-key": api_key
+    }
+
+    with profiler.stage(f"GET {profiler.endpoint(url)}"):
+        response = requests.get(url, headers=headers, params=params)
+    profiler.record_download(url, len(response.content))
+    data = response.json()
+
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(data, f)
+    except Exception as e:
+        print(f"Error writing {cache_file}: {e}")
+
+    if "response" not in data or not data["response"]:
+        return pd.DataFrame()
+
+    return pd.json_normalize(data["response"])
+
+
+# Columns of the API-Sports records used by the pages (LEAN_MODE keeps only these)
+injury_columns = [
+    "player.id", "player.name", "player.type", "player.reason",
+    "team.id", "team.name", "fixture.date", "league.season"
+]
+
+
+def load_injury_dataset(league, season):
+    df = fetch_injuries(API_KEY, league=league, season=season, cache_file=injury_cache_file(league, season))
+    if LEAN_MODE and not df.empty:
+        df = df[[col for col in injury_columns if col in df.columns]]
+    return Dataset({"injuries": df})
+
+
+def available_injury_seasons(league=DEFAULT_INJURY_LEAGUE):
+    """Seasons that can be loaded: all of them with an API key, otherwise only cached ones."""
+    if API_KEY:
+        return INJURY_SEASONS
+    return [season for season in INJURY_SEASONS if os.path.exists(injury_cache_file(league, season))]
+
+
+injury_datasets = DatasetRegistry()
+injury_datasets.register_source("api-sports", load_injury_dataset)
+
+
+def injury_records(season, league=DEFAULT_INJURY_LEAGUE):
+    # Always go through the registry so eviction can free seasons nobody is viewing
+    return injury_datasets.get("api-sports", league, season).frames["injuries"]
@@ -0,0 +1,241 @@
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+import pandas as pd
+
+
+MAPPING_CACHE_FILE = "player-id-map.json"
+
+# API-Sports team names -> FPL team names
+TEAM_ALIASES = {
+    "manchester united": "man utd",
+    "manchester city": "man city",
+    "tottenham": "spurs",
+    "tottenham hotspur": "spurs",
+    "nottingham forest": "nott'm forest",
+    "wolverhampton wanderers": "wolves",
+    "newcastle united": "newcastle",
+    "brighton & hove albion": "brighton",
+    "west ham united": "west ham",
+    "leeds united": "leeds",
+    "leicester city": "leicester",
+    "norwich city": "norwich",
+}
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation: 'Ødegaard' -> 'odegaard'."""
+    if not isinstance(name, str):
+        return ""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = name.lower().replace("ø", "o").replace("ß", "ss")
+    name = re.sub(r"[^a-z\s]", " ", name)
+    return " ".join(name.split())
+
+
+def normalize_team(team):
+    team = team.lower().strip() if isinstance(team, str) else ""
+    return TEAM_ALIASES.get(team, team)
+
+
+class PlayerNameIndex:
+    """
+    Blocked name index over FPL players.
+
+    Every player is filed under each token of their first_name, second_name
+    and web_name, once per (team, token) block and once in a name-only
+    block, so a lookup only compares against the handful of players sharing
+    a name token instead of the whole player list.
+    """
+
+    def __init__(self, players_df):
+        self.blocks = defaultdict(list)
+        self.name_blocks = defaultdict(list)
+
+        for player_id, first, second, web, team in zip(
+            players_df["id"], players_df["first_name"], players_df["second_name"],
+            players_df["web_name"], players_df["team"]
+        ):
+            first = normalize_name(first)
+            second = normalize_name(second)
+            web = normalize_name(web)
+            tokens = set(first.split()) | set(second.split()) | set(web.split())
+            candidate = (int(player_id), first, second, web, frozenset(tokens))
+
+            team_key = normalize_team(team)
+            for token in tokens:
+                self.blocks[(team_key, token)].append(candidate)
+                self.name_blocks[token].append(candidate)
+
+    @staticmethod
+    def _covers(candidate, tokens):
+        # Every token of the record's name appears in the FPL names, or as an
+        # abbreviation in web_name ("Diogo Jota" -> web_name "Diogo J.")
+        names = candidate[4]
+        return all(t in names or t[0] in names for t in tokens)
+
+    @classmethod
+    def _matches(cls, candidates, initial, full):
+        """Ids of the candidates matching the record name, at the first rule that matches any."""
+        # Mononyms ("Fabinho", "Thomas", "Allan") match a whole web, first or second name
+        if not initial and " " not in full:
+            rules = [lambda c, field=field: c[field] == full for field in (3, 1, 2)]
+        # Full names ("Mohamed Salah", "Son Heung-Min"), in either order
+        elif not initial:
+            rules = [
+                lambda c: full in (c[3], f"{c[1]} {c[2]}"),
+                lambda c: cls._covers(c, full.split()),
+            ]
+        # Initials ("K. Long")
+        else:
+            rules = [
+                lambda c: c[1].startswith(initial) and full in (c[3], c[2]),
+                lambda c: c[1].startswith(initial),
+            ]
+
+        for rule in rules:
+            ids = {c[0] for c in candidates if rule(c)}
+            if ids:
+                return ids
+        return set()
+
+    @staticmethod
+    def _candidates(blocks, keys):
+        seen = {}
+        for key in keys:
+            for candidate in blocks.get(key, []):
+                seen.setdefault(candidate[0], candidate)
+        return list(seen.values())
+
+    def resolve(self, name, team):
+        """Return the FPL id for an API-Sports name like 'K. Long' or 'Mohamed Salah', or None."""
+        name = normalize_name(name)
+        if not name:
+            return None
+
+        tokens = name.split()
+        initial = tokens[0] if len(tokens) > 1 and len(tokens[0]) == 1 else ""
+        surname = " ".join(tokens[1:]) if initial else name
+        keys = surname.split()
+
+        team_key = normalize_team(team)
+        ids = self._matches(self._candidates(self.blocks, [(team_key, key) for key in keys]), initial, surname)
+        if not ids:
+            # Nobody by that name at the club: the player may have moved since
+            ids = self._matches(self._candidates(self.name_blocks, keys), initial, surname)
+
+        # Two equally good matches are left unresolved rather than guessed
+        return ids.pop() if len(ids) == 1 else None
+
+
+def load_mapping_cache(path=MAPPING_CACHE_FILE):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return {}
+
+
+def save_mapping_cache(mapping, path=MAPPING_CACHE_FILE):
+    try:
+        with open(path, "w") as f:
+            json.dump(mapping, f)
+    except Exception as e:
+        print(f"Error writing {path}: {e}")
+
+
+def resolve_injury_players(injuries_df, players_df, season, cache_path=MAPPING_CACHE_FILE):
+    """
+    Attach an `fpl_id` column to API-Sports injury records.
+
+    Records are collapsed to unique (player, team, season) keys before
+    matching, and resolved keys are cached on disk so a refresh only
+    matches players it has not seen before. FPL reuses element ids every
+    season, so the FPL season is part of the key; misses are not cached.
+    """
+    if injuries_df.empty:
+        return injuries_df.assign(fpl_id=pd.Series(dtype="Int64"))
+
+    injuries_df = injuries_df.copy()
+    keys = (
+        f"{season}|" +
+        injuries_df["player.id"].astype(str) + "|" +
+        injuries_df["team.name"].astype(str) + "|" +
+        injuries_df["league.season"].astype(str)
+    )
+
+    cache = load_mapping_cache(cache_path)
+    resolved = dict(cache)
+    index = None
+    updated = False
+
+    unique = injuries_df.assign(_key=keys).drop_duplicates("_key")
+    for key, name, team in zip(unique["_key"], unique["player.name"], unique["team.name"]):
+        if key in resolved:
+            continue
+        if index is None:
+            index = PlayerNameIndex(players_df)
+        resolved[key] = index.resolve(name, team)
+        if resolved[key] is not None:
+            cache[key] = resolved[key]
+            updated = True
+
+    if updated:
+        save_mapping_cache(cache, cache_path)
+
+    injuries_df["fpl_id"] = keys.map(resolved).astype("Int64")
+    return injuries_df
+
+
+def _self_check():
+    """Real API-Sports names against hand-built FPL rows: python injury_matching.py"""
+    players = pd.DataFrame([
+        (1, "Mohamed", "Salah", "M.Salah", "Liverpool"),
+        (2, "Diogo", "Teixeira da Silva", "Diogo J.", "Liverpool"),
+        (3, "Bruno Miguel", "Borges Fernandes", "B.Fernandes", "Man Utd"),
+        (4, "Heung-Min", "Son", "Son", "Spurs"),
+        (5, "Lucas", "Rodrigues Moura da Silva", "Lucas Moura", "Spurs"),
+        (6, "Hee-Chan", "Hwang", "Hwang", "Wolves"),
+        (7, "Thomas", "Partey", "Partey", "Arsenal"),
+        (8, "Gabriel Fernando", "de Jesus", "G.Jesus", "Arsenal"),
+        (9, "Allan", "Marques Loureiro", "Allan", "Everton"),
+        (10, "Kyle", "Walker", "Walker", "Burnley"),
+        (11, "Kyle", "Walker-Peters", "Walker-Peters", "Man City"),
+        (12, "Phil", "Foden", "Foden", "Man City"),
+    ], columns=["id", "first_name", "second_name", "web_name", "team"])
+    expected = [
+        ("Mohamed Salah", "Liverpool", 1),
+        ("Diogo Jota", "Liverpool", 2),
+        ("Bruno Fernandes", "Manchester United", 3),
+        ("Son Heung-Min", "Tottenham", 4),
+        ("Lucas", "Tottenham", 5),
+        ("Hwang Hee-Chan", "Wolves", 6),
+        ("Thomas", "Arsenal", 7),
+        ("Gabriel Jesus", "Manchester City", 8),
+        ("Allan", "Everton", 9),
+        ("K. Walker", "Burnley", 10),
+        ("P. Foden", "Manchester City", 12),
+        ("Z. Nobody", "Arsenal", None),
+    ]
+
+    index = PlayerNameIndex(players)
+    failed = [
+        f"{name} ({team}): expected {want}, got {got}"
+        for name, team, want in expected
+        if (got := index.resolve(name, team)) != want
+    ]
+    for line in failed:
+        print(f"FAIL {line}")
+    print(f"{len(expected) - len(failed)}/{len(expected)} names resolved as expected")
+    return not failed
+
+
+if __name__ == "__main__":
+    raise SystemExit(0 if _self_check() else 1)
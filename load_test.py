@@ -0,0 +1,388 @@
+"""
+Concurrent-user load test for the Dash callbacks.
+
+    python load_test.py --clients 50 --duration 30
+    python load_test.py --url http://127.0.0.1:8050 --clients 20 --baseline load-baseline.json
+
+Without --url the app is loaded in this process and driven through Flask's
+test client, so no server has to be running. Each simulated client follows
+an interaction script against the real /_dash-update-component endpoint.
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LocalClient:
+    """Drives the in-process Flask server."""
+
+    def __init__(self, server):
+        self.client = server.test_client()
+
+    def get(self, path):
+        response = self.client.get(path)
+        return response.status_code, response.get_data()
+
+    def post(self, path, body):
+        response = self.client.post(path, json=body)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    """Drives a running server over HTTP."""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url.rstrip("/")
+        self.session = requests.Session()
+
+    def get(self, path):
+        response = self.session.get(self.base_url + path)
+        return response.status_code, response.content
+
+    def post(self, path, body):
+        response = self.session.post(self.base_url + path, json=body)
+        return response.status_code, response.content
+
+
+def parse_outputs(output):
+    """'..a.b...c.d@hash..' -> [{'id': 'a', 'property': 'b'}, ...]"""
+    def parse(spec):
+        component_id, prop = spec.rsplit(".", 1)
+        return {"id": component_id, "property": prop.split("@")[0]}
+
+    if output.startswith(".."):
+        return [parse(spec) for spec in output[2:-2].split("...")]
+    return parse(output)
+
+
+class CallbackIndex:
+    """Finds callbacks in /_dash-dependencies by their input/state props."""
+
+    def __init__(self, client):
+        status, body = client.get("/_dash-dependencies")
+        if status != 200:
+            raise RuntimeError(f"/_dash-dependencies returned {status}")
+        self.dependencies = json.loads(body)
+
+    def body(self, inputs, state=None):
+        state = state or {}
+        for dep in self.dependencies:
+            dep_inputs = {f"{i['id']}.{i['property']}" for i in dep["inputs"]}
+            dep_state = {f"{s['id']}.{s['property']}" for s in dep["state"]}
+            if dep_inputs == set(inputs) and dep_state == set(state):
+                break
+        else:
+            raise KeyError(f"No callback with inputs {sorted(inputs)}")
+
+        def props(specs, values):
+            return [
+                {"id": s["id"], "property": s["property"], "value": values[f"{s['id']}.{s['property']}"]}
+                for s in specs
+            ]
+
+        return {
+            "output": dep["output"],
+            "outputs": parse_outputs(dep["output"]),
+            "inputs": props(dep["inputs"], inputs),
+            "state": props(dep["state"], state),
+            "changedPropIds": list(inputs),
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, ok):
+        with self._lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+
+def find_component(layout, component_id):
+    """Depth-first search of a serialized Dash layout for one component id."""
+    if isinstance(layout, list):
+        for child in layout:
+            found = find_component(child, component_id)
+            if found is not None:
+                return found
+    elif isinstance(layout, dict):
+        props = layout.get("props", {})
+        if props.get("id") == component_id:
+            return props
+        for value in props.values():
+            found = find_component(value, component_id)
+            if found is not None:
+                return found
+    return None
+
+
+def page_layout(client, index, path):
+    """The layout Dash pages serves for `path`, as the browser receives it."""
+    body = index.body({"_pages_location.pathname": path, "_pages_location.search": ""})
+    status, response = client.post("/_dash-update-component", body)
+    if status != 200:
+        raise RuntimeError(f"Rendering {path} returned {status}")
+    return response_value(response, "_pages_content", "children")
+
+
+def load_sample_data(client, index):
+    """Pick realistic filter values from the export route and page layouts instead of hard-coding them."""
+    status, body = client.get("/export/players.csv")
+    if status != 200:
+        raise RuntimeError(f"/export/players.csv returned {status}")
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+
+    # Only the seasons the dropdown offers; others would time a path no browser can reach
+    season_dropdown = find_component(page_layout(client, index, "/teams"), "injury-season-dropdown")
+    return {
+        "teams": sorted({r["team"] for r in rows if r["team"]}),
+        "positions": sorted({r["position"] for r in rows if r["position"]}),
+        "players": [(int(r["id"]), r["web_name"]) for r in rows],
+        "ages": sorted(int(r["age"]) for r in rows),
+        "injury_seasons": [o["value"] for o in (season_dropdown or {}).get("options", [])],
+    }
+
+
+def response_value(response, component_id, prop):
+    """Pull one output value out of a /_dash-update-component response body."""
+    if not response:
+        return None
+    try:
+        return json.loads(response)["response"][component_id][prop]
+    except (ValueError, KeyError):
+        return None
+
+
+# Scripts receive each response body back from `yield`, so later steps can
+# send what the browser would hold by then (e.g. the rendered snapshot version).
+
+def players_script(index, sample, rng):
+    """A user narrowing the Players page down and opening a profile."""
+    teams = rng.sample(sample["teams"], rng.randint(1, 3)) if rng.random() < 0.7 else None
+    positions = rng.sample(sample["positions"], 1) if rng.random() < 0.5 else None
+    age_range = [sample["ages"][0], rng.choice(sample["ages"])]
+    filters = {
+        "players-team-filter.value": teams,
+        "players-position-filter.value": positions,
+        "players-age-filter.value": age_range,
+    }
+    response = yield "update_players_view", index.body(filters)
+    version = response_value(response, "players-snapshot-version", "data")
+
+    player_id, web_name = rng.choice(sample["players"])
+    for length in range(1, min(len(web_name), 4) + 1):
+        yield "update_player_options", index.body(
+            {"player-dropdown.search_value": web_name[:length], **filters},
+            {"player-dropdown.value": None},
+        )
+
+    yield "update_player_profile", index.body({"player-dropdown.value": player_id})
+    yield "push_player_changes", index.body(
+        {"players-refresh.n_intervals": 1},
+        {"players-snapshot-version.data": version, **filters},
+    )
+
+
+def teams_script(index, sample, rng):
+    """A user flicking through teams and modes on the Teams page."""
+    team = None
+    mode = "defense"
+    for step in range(3):
+        # The first step is the page load, which renders a team like a switch does
+        switch_team = step == 0 or rng.random() < 0.6
+        if switch_team:
+            team = rng.choice(sample["teams"])
+        else:
+            mode = "attack" if mode == "defense" else "defense"
+
+        response = yield "update_team_dashboard", index.body({"team-dropdown.value": team, "mode-dropdown.value": mode})
+        version = response_value(response, "team-status-version", "data")
+        # Changing team also refreshes the upcoming fixtures panel
+        if switch_team:
+            yield "update_upcoming_fixtures", index.body({
+                "team-dropdown.value": team,
+                "fixtures-count.value": 5,
+                "fixtures-date-range.start_date": None,
+                "fixtures-date-range.end_date": None,
+            })
+        yield "push_team_status_changes", index.body(
+            {"team-status-refresh.n_intervals": 1},
+            {"team-status-version.data": version, "team-dropdown.value": team},
+        )
+    if sample["injury_seasons"]:
+        yield "update_injury_history", index.body({"injury-season-dropdown.value": rng.choice(sample["injury_seasons"])})
+
+
+SCRIPTS = [players_script, teams_script]
+
+
+def run_client(make_client, index, sample, recorder, deadline, think_seconds, seed):
+    client = make_client()
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        steps = rng.choice(SCRIPTS)(index, sample, rng)
+        response = None
+        while True:
+            try:
+                name, body = steps.send(response)
+            except StopIteration:
+                break
+
+            start = time.perf_counter()
+            response = None
+            try:
+                status, content = client.post("/_dash-update-component", body)
+                ok = status in (200, 204)
+                if status == 200:
+                    response = content
+            except Exception:
+                ok = False
+            recorder.record(name, time.perf_counter() - start, ok)
+
+            if time.perf_counter() >= deadline:
+                return
+            if think_seconds:
+                time.sleep(rng.uniform(0, 2 * think_seconds))
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def summarize(recorder, elapsed, clients):
+    callbacks = {}
+    total = 0
+    for name, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        total += len(values)
+        callbacks[name] = {
+            "requests": len(values),
+            "throughput": len(values) / elapsed,
+            "error_rate": recorder.errors[name] / len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+        }
+    return {
+        "clients": clients,
+        "seconds": elapsed,
+        "requests": total,
+        "throughput": total / elapsed,
+        "callbacks": callbacks,
+    }
+
+
+def print_report(summary, baseline=None):
+    def delta(name, field):
+        if not baseline or name not in baseline.get("callbacks", {}):
+            return ""
+        old = baseline["callbacks"][name][field]
+        return f" ({(summary['callbacks'][name][field] - old) / old:+.0%})" if old else ""
+
+    print(f"\n{summary['clients']} clients, {summary['requests']} requests in {summary['seconds']:.1f}s "
+          f"= {summary['throughput']:.1f} req/s")
+    if baseline:
+        print(f"Baseline: {baseline['throughput']:.1f} req/s with {baseline['clients']} clients")
+
+    print(f"\n{'callback':28} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>16} {'p99 ms':>16}")
+    for name, stats in summary["callbacks"].items():
+        print(f"{name:28} {stats['throughput']:8.1f} {stats['error_rate']:7.1%} {stats['p50_ms']:8.1f} "
+              f"{stats['p95_ms']:8.1f}{delta(name, 'p95_ms'):>8} {stats['p99_ms']:8.1f}{delta(name, 'p99_ms'):>8}")
+
+
+def regressions(summary, baseline, tolerance, min_delta_ms):
+    """Callbacks whose p95 grew, or whose error rate rose, beyond the tolerance."""
+    failed = []
+    for name, stats in summary["callbacks"].items():
+        old = baseline.get("callbacks", {}).get(name)
+        if old is None:
+            continue
+        # Sub-millisecond callbacks jitter by large percentages; ignore small absolute moves
+        grown = stats["p95_ms"] - old["p95_ms"]
+        if stats["p95_ms"] > old["p95_ms"] * (1 + tolerance) and grown > min_delta_ms:
+            failed.append(f"{name}: p95 {old['p95_ms']:.1f}ms -> {stats['p95_ms']:.1f}ms")
+        if stats["error_rate"] > old["error_rate"] + tolerance / 10:
+            failed.append(f"{name}: error rate {old['error_rate']:.1%} -> {stats['error_rate']:.1%}")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Dash callbacks.")
+    parser.add_argument("--url", help="base URL of a running server; default loads the app in-process")
+    parser.add_argument("--clients", type=int, default=20, help="number of simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run for")
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's actions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against a saved JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 growth vs. baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=5, help="ignore p95 growth smaller than this")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        def make_client():
+            return HttpClient(args.url)
+    else:
+        from app import app
+
+        def make_client():
+            return LocalClient(app.server)
+
+    setup_client = make_client()
+    index = CallbackIndex(setup_client)
+    sample = load_sample_data(setup_client, index)
+    recorder = Recorder()
+
+    print(f"Running {args.clients} clients for {args.duration:.0f}s...")
+    start = time.perf_counter()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        futures = [
+            pool.submit(
+                run_client, make_client, index, sample, recorder,
+                deadline, args.think_ms / 1000, args.seed + i,
+            )
+            for i in range(args.clients)
+        ]
+        # Surface script errors instead of silently losing a client
+        for future in futures:
+            future.result()
+    summary = summarize(recorder, time.perf_counter() - start, args.clients)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    print_report(summary, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSaved results to {args.save_baseline}")
+
+    if baseline:
+        failed = regressions(summary, baseline, args.tolerance, args.min_delta_ms)
+        for line in failed:
+            print(f"REGRESSION {line}")
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
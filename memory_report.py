@@ -0,0 +1,76 @@
+import sys
+import types
+
+import pandas as pd
+from flask import jsonify
+from werkzeug.local import LocalProxy
+
+
+# Globals smaller than this are left out of the report
+MIN_REPORTED_BYTES = 64 * 1024
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by obj, counting each shared object once."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(obj, "to_plotly_json") and hasattr(obj, "layout"):
+        # Plotly figures keep their data in nested dicts
+        return deep_sizeof(obj.to_plotly_json(), seen)
+    if isinstance(obj, (types.ModuleType, types.FunctionType, type)):
+        return 0
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def module_memory(module):
+    """Per-global memory for one page module, largest first."""
+    seen = set()
+    rows = []
+    for name, value in vars(module).items():
+        # LocalProxy globals (flask.request) belong to whatever request is active
+        if name.startswith("__") or isinstance(value, (types.ModuleType, types.FunctionType, type, LocalProxy)):
+            continue
+        size = deep_sizeof(value, seen)
+        if size >= MIN_REPORTED_BYTES:
+            rows.append({"object": name, "type": type(value).__name__, "bytes": size})
+    return sorted(rows, key=lambda row: -row["bytes"])
+
+
+def process_rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        import resource
+        return resident_pages * resource.getpagesize()
+    except Exception:
+        return None
+
+
+def register_diagnostics_routes(server):
+    @server.route("/diagnostics/memory")
+    def memory_diagnostics():
+        pages = {
+            name: module_memory(module)
+            for name, module in list(sys.modules.items())
+            if name.startswith("pages.")
+        }
+        return jsonify({
+            "rss_bytes": process_rss_bytes(),
+            "pages": pages,
+            "totals": {name: sum(row["bytes"] for row in rows) for name, rows in pages.items()},
+        })
@@ -1,77 +1,19 @@
-import pandas as pd
-import requests
-import concurrent.futures
-from dash import html, dcc, register_page, dash_table, callback, Input, Output
-
-from dotenv import load_dotenv
-import os
-load_dotenv()
-
-
-class APIProcessor:
-    def __init__(self):
-        self.current_player_info = None
-        self.total_players = 594
-
-    def fetch(self, url):
-        response = requests.get(url)
-        return response.json()
-
-    def get_general_information(self):
-        """Loads player list, teams, and position info."""
-        url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-        plf = (requests.get(url)).json()
-
-        current_team_info = plf['teams']
-        self.current_player_info = plf['elements']
-        position_info = plf['element_types']
-
-        return self.current_player_info, current_team_info, position_info
-
-    def get_fixtures(self):
-        url = "https://fantasy.premierleague.com/api/fixtures/"
-        fixture_data = requests.get(url).json()
-
-        team_dict = {
-            "1": "Arsenal","2": "Aston Villa","3": "Burnley","4": "Bournemouth","5": "Brentford",
-            "6": "Brighton","7": "Chelsea","8": "Crystal Palace","9": "Everton","10": "Fulham",
-            "11": "Leeds","12": "Liverpool","13": "Man City","14": "Man Utd","15": "Newcastle",
-            "16": "Nott'm Forest","17": "Sunderland","18": "Spurs","19": "West Ham","20": "Wolves"
-        }
-
-        for game in fixture_data:
-            if game["event"] is not None:
-                game["event"] = f"Gameweek {game['event']}"
-
-            game["team_a"] = team_dict[str(game["team_a"])]
-            game["team_h"] = team_dict[str(game["team_h"])]
-
-        return fixture_data
-
-    def get_gameweek_live_data(self):
-        gameweeks_data = {}
-        for i in range(39):
-            url = f"https://fantasy.premierleague.com/api/event/{i}/live/"
-            response = requests.get(url).json()
-            gameweeks_data[f"Gameweek {i}"] = response
-        return gameweeks_data
-
-
-class InjuryReports:
-    def __init__(self):
-        api = APIProcessor()
-
-        print("Fetching FPL data")
-        self.current_players_info, self.current_teams_info, self.position_info = api.get_general_information()
-        self.fixture_data = api.get_fixtures()
-        self.current_gameweek_data = api.get_gameweek_live_data()
-        print("Completed Loading  Data")
-
-    def to_df(self, data):
-        if isinstance(data, pd.DataFrame):
-            return data
-        return pd.json_normalize(data)
+from dash import html, dcc, register_page, dash_table, callback, get_app, Input, Output, State, Patch, no_update
+from flask import request
 
+import gc
+import pandas as pd
+from export import export_response
+from fpl_data import (
+    FPL_SEASON, LEAN_MODE, POLL_SECONDS, REFRESH_SECONDS,
+    InjuryReports, build_filtered_players, load_filtered_players,
+)
+from injury_data import available_injury_seasons, injury_records
+from injury_matching import resolve_injury_players
+from player_search import PlayerSearchIndex
+from similar_players import SimilarPlayerIndex
+from snapshot_diff import SnapshotFeed
+from startup_profile import profiler
 
 
 injury_reports = InjuryReports()
@@ -80,17 +22,6 @@ players_report = injury_reports.to_df(injury_reports.current_players_info)
 team_report = injury_reports.to_df(injury_reports.current_teams_info)
 position_report = injury_reports.to_df(injury_reports.position_info)
 
-# Filter players with meaningful status
-injury_reports_filtered = players_report[players_report["status"] != "u"]
-
-mapping = {
-    'a': 'Available',
-    'i': 'Injured',
-    'd': 'Doubtful'
-}
-
-injury_reports_filtered['status'] = injury_reports_filtered['status'].map(mapping)
-
 important_features = [
     "id", "first_name", "second_name", "web_name",
     "team", "element_type", "goals_scored", "assists", "saves",
@@ -102,26 +33,50 @@ important_features = [
     "birth_date", "team_join_date"
 ]
 
-filtered_players = injury_reports_filtered[important_features].copy()
-
-# Map team IDs team names
-team_map = team_report.set_index("id")["name"].to_dict()
-filtered_players["team"] = filtered_players["team"].map(team_map)
+# Fields pushed to clients as deltas; a change in team/position/age forces a full reload
+diff_columns = [
+    "status", "news",
+    "chance_of_playing_this_round", "chance_of_playing_next_round",
+    "minutes",
+]
+structural_columns = ["team", "position", "age"]
 
-# Map position IDs position name
-pos_map = position_report.set_index("id")["singular_name_short"].to_dict()
-filtered_players.rename(columns={"element_type": "position"}, inplace=True)
-filtered_players["position"] = filtered_players["position"].map(pos_map)
 
-# Convert birth_date ge
-filtered_players.rename(columns={"birth_date": "age"}, inplace=True)
-filtered_players = filtered_players.dropna(subset=["age"])
-filtered_players["age"] = filtered_players["age"].apply(
-    lambda x: 2025 - int(x.split("-")[0])
-)
+filtered_players = build_filtered_players(players_report, team_report, position_report, important_features)
 
 print(f"Final filtered player count: {len(filtered_players)}")
 
+# Link historic API-Sports injury records of every loadable season to FPL ids
+with profiler.stage("resolve_injury_players"):
+    injury_history = pd.concat(
+        [
+            resolve_injury_players(injury_records(season), filtered_players, FPL_SEASON)
+            for season in available_injury_seasons()
+        ] or [pd.DataFrame(columns=["fpl_id"])],
+        ignore_index=True,
+    )
+if not injury_history.empty:
+    injury_history = injury_history.dropna(subset=["fpl_id"])
+    print(f"Matched {injury_history['fpl_id'].nunique()} players to historic injury records")
+
+player_search = PlayerSearchIndex(filtered_players)
+similar_players = SimilarPlayerIndex(filtered_players)
+
+if LEAN_MODE:
+    if not injury_history.empty:
+        injury_history = injury_history[["fpl_id", "fixture.date", "team.name", "player.reason", "player.type"]]
+    injury_reports.release_raw_data()
+    del players_report, team_report, position_report
+    gc.collect()
+
+players_feed = SnapshotFeed(
+    lambda: load_filtered_players(important_features),
+    key="id",
+    columns=diff_columns + structural_columns,
+    initial=filtered_players,
+    refresh_seconds=REFRESH_SECONDS,
+)
+
 
 register_page(__name__, path="/players", name="Player Stats")
 
@@ -145,6 +100,8 @@ layout = html.Div(
     children=[
         html.H2("Premier League Player Injury & Status Report"),
         html.P(f"Loaded {len(filtered_players)} players with injury/status info."),
+        dcc.Interval(id="players-refresh", interval=POLL_SECONDS * 1000),
+        dcc.Store(id="players-snapshot-version"),
 
         html.Div(
             style={"display": "flex", "gap": "16px", "marginBottom": "24px"},
@@ -205,7 +162,7 @@ layout = html.Div(
                         dcc.Dropdown(
                             id="player-dropdown",
                             options=[],  
-                            placeholder="Choose a player",
+                            placeholder="Type to search players",
                         ),
                     ],
                 ),
@@ -227,7 +184,8 @@ layout = html.Div(
 
         dash_table.DataTable(
             id="players-table",
-            data=filtered_players.to_dict("records"),
+            # update_players_view fills the table on page load anyway
+            data=[] if LEAN_MODE else filtered_players.to_dict("records"),
             columns=[
                 {"name": "Name", "id": "web_name"},
                 {"name": "Team", "id": "team"},
@@ -258,16 +216,7 @@ layout = html.Div(
 
 
 
-@callback(
-    Output("players-table", "data"),
-    Output("player-dropdown", "options"),
-    Input("players-team-filter", "value"),
-    Input("players-position-filter", "value"),
-    Input("players-age-filter", "value"),
-)
-def update_players_view(selected_teams, selected_positions, age_range):
-    df = filtered_players.copy()
-
+def filter_players(df, selected_teams, selected_positions, age_range):
     # Team filter
     if selected_teams:
         df = df[df["team"].isin(selected_teams)]
@@ -281,16 +230,85 @@ def update_players_view(selected_teams, selected_positions, age_range):
         min_age, max_age = age_range
         df = df[(df["age"] >= min_age) & (df["age"] <= max_age)]
 
-    # Dropdown options based on filtered df
-    dropdown_options = [
-        {
-            "label": f"{row['web_name']} ({row['team']} - {row['position']})",
-            "value": int(row["id"]),
-        }
-        for _, row in df.iterrows()
-    ]
+    return df
 
-    return df.to_dict("records"), dropdown_options
+
+@callback(
+    Output("players-table", "data"),
+    Output("players-snapshot-version", "data"),
+    Input("players-team-filter", "value"),
+    Input("players-position-filter", "value"),
+    Input("players-age-filter", "value"),
+)
+def update_players_view(selected_teams, selected_positions, age_range):
+    version = players_feed.version
+    df = filter_players(players_feed.current.copy(), selected_teams, selected_positions, age_range)
+
+    return df.to_dict("records"), version
+
+
+@callback(
+    Output("players-table", "data", allow_duplicate=True),
+    Output("players-snapshot-version", "data", allow_duplicate=True),
+    Input("players-refresh", "n_intervals"),
+    State("players-snapshot-version", "data"),
+    State("players-team-filter", "value"),
+    State("players-position-filter", "value"),
+    State("players-age-filter", "value"),
+    prevent_initial_call=True,
+)
+def push_player_changes(_, client_version, selected_teams, selected_positions, age_range):
+    global player_search, similar_players
+    if players_feed.maybe_refresh():
+        player_search = PlayerSearchIndex(players_feed.current)
+        similar_players = SimilarPlayerIndex(players_feed.current)
+
+    version = players_feed.version
+    changes = players_feed.changes_since(client_version)
+    if changes is not None and not changes["changed"] and not changes["added"] and not changes["removed"]:
+        return no_update, no_update
+
+    df = filter_players(players_feed.current, selected_teams, selected_positions, age_range)
+
+    # Rows were added/removed or moved between filters: resend the table
+    if (
+        changes is None or changes["added"] or changes["removed"]
+        or any(col in fields for fields in changes["changed"].values() for col in structural_columns)
+    ):
+        return df.to_dict("records"), version
+
+    # Otherwise patch only the changed cells of rows the client is showing
+    row_of = {player_id: i for i, player_id in enumerate(df["id"].tolist())}
+    patch = Patch()
+    for player_id, fields in changes["changed"].items():
+        if player_id not in row_of:
+            continue
+        for col, value in fields.items():
+            patch[row_of[player_id]][col] = value
+
+    return patch, version
+
+
+@callback(
+    Output("player-dropdown", "options"),
+    Input("player-dropdown", "search_value"),
+    Input("players-team-filter", "value"),
+    Input("players-position-filter", "value"),
+    Input("players-age-filter", "value"),
+    State("player-dropdown", "value"),
+)
+def update_player_options(search_value, selected_teams, selected_positions, age_range, selected_player_id):
+    # Only the top matches for the typed text are sent to the browser
+    matches = player_search.search(search_value, selected_teams, selected_positions, age_range)
+    options = player_search.options(matches)
+
+    # Keep the current selection so its label still renders
+    if selected_player_id is not None and all(o["value"] != selected_player_id for o in options):
+        selected_option = player_search.option_for(selected_player_id)
+        if selected_option is not None:
+            options.append(selected_option)
+
+    return options
 
 
 
@@ -302,7 +320,8 @@ def update_player_profile(selected_player_id):
     if selected_player_id is None:
         return html.I("Select a player to see details.")
 
-    row = filtered_players[filtered_players["id"] == selected_player_id]
+    current_players = players_feed.current
+    row = current_players[current_players["id"] == selected_player_id]
     if row.empty:
         return html.I("Player not found in current data.")
 
@@ -331,5 +350,64 @@ def update_player_profile(selected_player_id):
                 ]
             ),
             html.P(f"Team join date: {row['team_join_date']}"),
+            html.H4("Similar Players"),
+            similar_players_list(selected_player_id),
+            html.H4("Injury History"),
+            injury_history_list(selected_player_id),
+        ]
+    )
+
+
+def similar_players_list(player_id):
+    if int(player_id) not in similar_players.row_of:
+        return html.I("Not enough minutes to compare.")
+
+    matches = similar_players.similar(player_id)
+    if not matches:
+        return html.I("No players with a similar profile.")
+
+    return html.Ol(
+        children=[
+            html.Li(f"{label} - {score:.0%} match")
+            for _, label, score in matches
+        ]
+    )
+
+
+def injury_history_list(player_id):
+    if injury_history.empty:
+        return html.I("No historic injury data loaded.")
+
+    records = injury_history[injury_history["fpl_id"] == player_id]
+    if records.empty:
+        return html.I("No historic injuries recorded.")
+
+    records = records.sort_values("fixture.date")
+    return html.Ul(
+        children=[
+            html.Li(f"{date[:10]} ({team}): {reason} - {kind}")
+            for date, team, reason, kind in zip(
+                records["fixture.date"], records["team.name"],
+                records["player.reason"], records["player.type"]
+            )
         ]
     )
+
+
+@get_app().server.route("/export/players.<fmt>")
+def export_players(fmt):
+    """
+    Stream the player snapshot as CSV or Arrow, e.g.
+    /export/players.csv?team=Arsenal&position=MID&min_age=20&max_age=25
+    """
+    age_range = [
+        request.args.get("min_age", age_min, type=int),
+        request.args.get("max_age", age_max, type=int),
+    ]
+    df = filter_players(
+        players_feed.current,
+        request.args.getlist("team"),
+        request.args.getlist("position"),
+        age_range,
+    )
+    return export_response(df, fmt, "players")
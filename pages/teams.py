@@ -1,136 +1,20 @@
 
 
-from dash import html, register_page, dcc, dash_table, callback, Input, Output
+from dash import html, register_page, dcc, dash_table, callback, get_app, Input, Output, State, Patch, no_update
+from flask import request
 import pandas as pd
-import requests
-from dotenv import load_dotenv
-import os
+import gc
 import plotly.express as px
-import json
 
-load_dotenv()
-API_KEY = os.getenv("API_KEY")
-
-
-def fetch_injuries(API_KEY, league=None, season=None, team=None, player=None):
-    api_key = API_KEY
-
-    if not api_key:
-        if os.path.exists("saved-output.json"):
-            try:
-                with open("saved-output.json", "r") as f:
-                    data = json.load(f)
-
-                if isinstance(data, dict) and "response" in data and data["response"]:
-                    return pd.json_normalize(data["response"])
-                elif isinstance(data, list) and data:
-                    return pd.json_normalize(data)
-                else:
-                    return pd.DataFrame()
-            except Exception as e:
-                print(f"Error reading saved-output.json: {e}")
-                return pd.DataFrame()
-        else:
-            print("No API key and 'saved-output.json' not found. Returning empty DataFrame.")
-            return pd.DataFrame()
-
-    url = "https://v3.football.api-sports.io/injuries"
-
-    params = {}
-    if league is not None:
-        params["league"] = league
-    if season is not None:
-        params["season"] = season
-    if team is not None:
-        params["team"] = team
-    if player is not None:
-        params["player"] = player
-
-    headers = {
-        "x-apisports-key": api_key
-    }
-
-    response = requests.get(url, headers=headers, params=params)
-    data = response.json()
-
-    try:
-        with open("saved-output.json", "w") as f:
-            json.dump(data, f)
-    except Exception as e:
-        print(f"Error writing saved-output.json: {e}")
-
-    if "response" not in data or not data["response"]:
-        return pd.DataFrame()
-
-    return pd.json_normalize(data["response"])
-
-
-Df = fetch_injuries(API_KEY, league=39, season=2021)
-
-class APIProcessor:
-    def __init__(self):
-        self.current_player_info = None
-        self.total_players = 594
-
-    def fetch(self, url):
-        response = requests.get(url)
-        return response.json()
-
-    def get_general_information(self):
-        """Loads player list, teams, and position info."""
-        url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-        plf = (requests.get(url)).json()
-
-        current_team_info = plf['teams']
-        self.current_player_info = plf['elements']
-        position_info = plf['element_types']
-
-        return self.current_player_info, current_team_info, position_info
-
-    def get_fixtures(self):
-        url = "https://fantasy.premierleague.com/api/fixtures/"
-        fixture_data = requests.get(url).json()
-
-        team_dict = {
-            "1": "Arsenal", "2": "Aston Villa", "3": "Burnley", "4": "Bournemouth", "5": "Brentford",
-            "6": "Brighton", "7": "Chelsea", "8": "Crystal Palace", "9": "Everton", "10": "Fulham",
-            "11": "Leeds", "12": "Liverpool", "13": "Man City", "14": "Man Utd", "15": "Newcastle",
-            "16": "Nott'm Forest", "17": "Sunderland", "18": "Spurs", "19": "West Ham", "20": "Wolves"
-        }
-
-        for game in fixture_data:
-            if game["event"] is not None:
-                game["event"] = f"Gameweek {game['event']}"
-
-            game["team_a"] = team_dict.get(str(game["team_a"]), game["team_a"])
-            game["team_h"] = team_dict.get(str(game["team_h"]), game["team_h"])
-
-        return fixture_data
-
-    def get_gameweek_live_data(self):
-        gameweeks_data = {}
-        for i in range(39):
-            url = f"https://fantasy.premierleague.com/api/event/{i}/live/"
-            response = requests.get(url).json()
-            gameweeks_data[f"Gameweek {i}"] = response
-        return gameweeks_data
-
-
-
-class InjuryReports:
-    def __init__(self):
-        api = APIProcessor()
-
-        print("Fetching FPL data...")
-        self.current_players_info, self.current_teams_info, self.position_info = api.get_general_information()
-        self.fixture_data = api.get_fixtures()
-        self.current_gameweek_data = api.get_gameweek_live_data()
-        print("Completed Loading FPL Data")
-
-    def to_df(self, data):
-        if isinstance(data, pd.DataFrame):
-            return data
-        return pd.json_normalize(data)
+from export import export_response
+from fixture_index import FixtureIndex
+from fpl_data import (
+    LEAN_MODE, POLL_SECONDS, REFRESH_SECONDS,
+    InjuryReports, build_filtered_players, load_filtered_players,
+)
+from injury_data import DEFAULT_INJURY_SEASON, available_injury_seasons, injury_records
+from snapshot_diff import SnapshotFeed
+from startup_profile import profiler
 
 
 injury_reports = InjuryReports()
@@ -139,16 +23,6 @@ players_report = injury_reports.to_df(injury_reports.current_players_info)
 team_report = injury_reports.to_df(injury_reports.current_teams_info)
 position_report = injury_reports.to_df(injury_reports.position_info)
 
-injury_reports_filtered = players_report[players_report["status"] != "u"]
-
-mapping = {
-    'a': 'Available',
-    'i': 'Injured',
-    'd': 'Doubtful'
-}
-
-injury_reports_filtered['status'] = injury_reports_filtered['status'].map(mapping)
-
 important_features = [
     "id", "first_name", "second_name", "web_name",
     "team", "goals_scored", "assists", "saves",
@@ -166,30 +40,38 @@ important_features = [
     "team_join_date"
 ]
 
-filtered_players = injury_reports_filtered[important_features].copy()
+status_cols = ['Available', 'Doubtful', 'Injured']
 
-# Map team IDs → team names
-team_map = team_report.set_index("id")["name"].to_dict()
-filtered_players["team"] = filtered_players["team"].map(team_map)
 
-# Map position IDs → position name
-pos_map = position_report.set_index("id")["singular_name_short"].to_dict()
-filtered_players.rename(columns={"element_type": "position"}, inplace=True)
-filtered_players["position"] = filtered_players["position"].map(pos_map)
+def build_status_counts(filtered_players):
+    status_counts = (
+        filtered_players
+        .pivot_table(index="team", columns="status", aggfunc="size", fill_value=0)
+        .reset_index()
+    )
+    for col in status_cols:
+        if col not in status_counts:
+            status_counts[col] = 0
+    return status_counts
 
-# Convert birth_date → age
-filtered_players.rename(columns={"birth_date": "age"}, inplace=True)
-filtered_players = filtered_players.dropna(subset=["age"])
-filtered_players["age"] = filtered_players["age"].apply(
-    lambda x: 2025 - int(x.split("-")[0])
-)
+
+def load_status_counts():
+    """Re-fetch only bootstrap-static and recount player statuses per team."""
+    return build_status_counts(load_filtered_players(important_features))
+
+
+filtered_players = build_filtered_players(players_report, team_report, position_report, important_features)
 
 print(f"Final filtered player count: {len(filtered_players)}")
 
-status_counts = (
-    filtered_players
-    .pivot_table(index="team", columns="status", aggfunc="size", fill_value=0)
-    .reset_index()
+status_counts = build_status_counts(filtered_players)
+
+status_feed = SnapshotFeed(
+    load_status_counts,
+    key="team",
+    columns=status_cols,
+    initial=status_counts,
+    refresh_seconds=REFRESH_SECONDS,
 )
 
 team_stats = (
@@ -214,18 +96,21 @@ df_fixtures = injury_reports.to_df(fixture_report)
 df_fixtures['date'] = pd.to_datetime(df_fixtures['kickoff_time']).dt.date
 
 fixture_important_features = [
-    "event", "finished", "team_a", "team_a_score", "team_h", "team_h_score", "date"
+    "event", "finished", "team_a", "team_a_score", "team_h", "team_h_score", "date", "kickoff_time"
 ]
 
 df_fixtures = df_fixtures[fixture_important_features]
 
+fixture_index = FixtureIndex(df_fixtures)
+
 
-def build_team_results(fixtures_df, team_stats_df):
+def build_team_results(fixture_index, team_stats_df):
     """
     Combine team stats with match results and goal totals.
 
-    fixtures_df columns required:
-        ['team_a', 'team_h', 'team_a_score', 'team_h_score']
+    fixture_index:
+        FixtureIndex over fixtures with
+        ['team_a', 'team_h', 'team_a_score', 'team_h_score', 'kickoff_time']
 
     team_stats_df:
         contains one row per team
@@ -234,9 +119,9 @@ def build_team_results(fixtures_df, team_stats_df):
     records = []
 
     for team_name in teams:
-        # Filter matches where team played
-        home_matches = fixtures_df.loc[fixtures_df['team_h'] == team_name]
-        away_matches = fixtures_df.loc[fixtures_df['team_a'] == team_name]
+        # Matches where team played, straight from the index
+        home_matches = fixture_index.home(team_name)
+        away_matches = fixture_index.away(team_name)
         matches = pd.concat([home_matches, away_matches])
         matches = matches.sort_values(by='date')
 
@@ -309,7 +194,8 @@ def build_team_results(fixtures_df, team_stats_df):
     return final_df
 
 
-team_results = build_team_results(df_fixtures, team_stats)
+with profiler.stage("build_team_results"):
+    team_results = build_team_results(fixture_index, team_stats)
 
 
 def process_injury_data(df):
@@ -387,7 +273,14 @@ def process_injury_data(df):
     return summary_df, fig_heatmap
 
 
-summary_table, heatmap_fig = process_injury_data(Df)
+with profiler.stage("process_injury_data"):
+    summary_table, heatmap_fig = process_injury_data(injury_records(DEFAULT_INJURY_SEASON))
+
+if LEAN_MODE:
+    injury_reports.release_raw_data()
+    del players_report, team_report, position_report, filtered_players
+    del team_stats, fixture_report, df_fixtures
+    gc.collect()
 
 
 register_page(__name__, path="/teams", name="Team Stats")
@@ -396,6 +289,7 @@ defensive_cols = ['tackles', 'recoveries', 'clearances_blocks_interceptions',
                   'defensive_contribution', 'total_goals_against']
 attacking_cols = ['total_goals_for', 'home_wins', 'home_losses',
                   'home_draws', 'away_wins', 'away_losses', 'away_draws']
+congestion_cols = ['Next 7 Days', 'Next 14 Days', 'Next 28 Days', 'Days to Next Match']
 
 team_dropdown = dcc.Dropdown(
     id='team-dropdown',
@@ -420,13 +314,66 @@ components = [
     html.H2("Team Dashboard", style={"textAlign": "center", "marginTop": "20px"}),
     team_dropdown,
     mode_dropdown,
-    html.Div(id='team-output')  
+    dcc.Interval(id='team-status-refresh', interval=POLL_SECONDS * 1000),
+    dcc.Store(id='team-status-version'),
+    html.Div(
+        id='team-output',
+        children=[
+            dcc.Graph(id='team-stats-graph'),
+            # Static so the status poll can patch it before and after a team switch
+            dash_table.DataTable(
+                id='team-status-table',
+                data=[],
+                columns=[{"name": col, "id": col} for col in status_cols],
+                style_cell={'textAlign': 'center', 'padding': '5px'},
+                style_header={'fontWeight': 'bold', 'backgroundColor': '#f0f0f0'},
+                style_data_conditional=[
+                    {'if': {'filter_query': '{Injured} > 0'}, 'backgroundColor': '#ffe6e6'}
+                ]
+            ),
+            # Fixture congestion next to the squad status
+            dash_table.DataTable(
+                id='team-congestion-table',
+                data=[],
+                columns=[{"name": col, "id": col} for col in congestion_cols],
+                style_cell={'textAlign': 'center', 'padding': '5px'},
+                style_header={'fontWeight': 'bold', 'backgroundColor': '#f0f0f0'},
+                style_data_conditional=[
+                    {'if': {'filter_query': '{Next 14 Days} > 3'}, 'backgroundColor': '#fff4e0'}
+                ]
+            ),
+            html.P(
+                id='team-status-summary',
+                style={"textAlign": "center", "fontWeight": "bold", "marginTop": "20px"}
+            ),
+        ]
+    ),
+    html.Div([
+        html.H3(
+            "Upcoming Fixtures",
+            style={"textAlign": "center", "marginTop": "30px"}
+        ),
+        html.Div(
+            style={"display": "flex", "gap": "16px", "justifyContent": "center", "alignItems": "center"},
+            children=[
+                html.Label("Next"),
+                dcc.Input(id='fixtures-count', type='number', min=1, max=38, step=1, value=5),
+                html.Label("or between"),
+                dcc.DatePickerRange(id='fixtures-date-range'),
+            ]
+        ),
+        html.Div(id='fixtures-output')
+    ])
 ]
 
-if summary_table is not None and not summary_table.empty:
+def injury_history_components(summary_table, heatmap_fig):
+    if summary_table is None or summary_table.empty:
+        return [html.P("No injury data for this season.", style={"textAlign": "center"})]
+
+    history = []
 
     if heatmap_fig is not None:
-        components.append(
+        history.append(
             html.Div([
                 html.H3(
                     "Historic Injury Heatmap",
@@ -436,7 +383,7 @@ if summary_table is not None and not summary_table.empty:
             ])
         )
 
-    components.append(
+    history.append(
         html.Div([
             html.H3(
                 "Historic Injury Summary Table",
@@ -457,6 +404,30 @@ if summary_table is not None and not summary_table.empty:
             )
         ])
     )
+    return history
+
+
+season_dropdown = dcc.Dropdown(
+    id='injury-season-dropdown',
+    options=[{'label': f"{season}/{str(season + 1)[2:]}", 'value': season} for season in available_injury_seasons()],
+    value=DEFAULT_INJURY_SEASON,
+    clearable=False,
+    style={'width': '300px', 'margin': '20px auto'}
+)
+
+components.append(
+    html.Div([
+        html.H3(
+            "Historic Injuries",
+            style={"textAlign": "center", "marginTop": "30px"}
+        ),
+        season_dropdown,
+        html.Div(
+            id='injury-history-output',
+            children=injury_history_components(summary_table, heatmap_fig)
+        )
+    ])
+)
 
 layout = html.Div(
     style={"marginTop": "20px", "padding": "20px"},
@@ -464,8 +435,19 @@ layout = html.Div(
 )
 
 
+def status_summary(selected_team, df_status):
+    return (
+        f"{selected_team} has {df_status['Available'].values[0]} available players, "
+        f"{df_status['Doubtful'].values[0]} doubtful, and {df_status['Injured'].values[0]} injured."
+    )
+
+
 @callback(
-    Output('team-output', 'children'),
+    Output('team-stats-graph', 'figure'),
+    Output('team-status-table', 'data'),
+    Output('team-congestion-table', 'data'),
+    Output('team-status-summary', 'children'),
+    Output('team-status-version', 'data'),
     Input('team-dropdown', 'value'),
     Input('mode-dropdown', 'value')
 )
@@ -473,6 +455,11 @@ def update_team_dashboard(selected_team, mode):
     # Filter for selected team
     df_team = team_results[team_results['team'] == selected_team]
 
+    # Status counts come from the live snapshot, not the startup one
+    version = status_feed.version
+    current_status = status_feed.current
+    df_status = current_status[current_status['team'] == selected_team]
+
     # Determine which stats to show
     if mode == 'defense':
         cols = defensive_cols
@@ -489,27 +476,94 @@ def update_team_dashboard(selected_team, mode):
         title=title
     )
 
-    # Status table
-    status_cols = ['Available', 'Doubtful', 'Injured']
-    status_table = dash_table.DataTable(
-        data=df_team[status_cols].to_dict('records'),
-        columns=[{"name": col, "id": col} for col in status_cols],
-        style_cell={'textAlign': 'center', 'padding': '5px'},
-        style_header={'fontWeight': 'bold', 'backgroundColor': '#f0f0f0'},
-        style_data_conditional=[
-            {'if': {'filter_query': '{Injured} > 0'}, 'backgroundColor': '#ffe6e6'}
-        ]
+    return (
+        fig,
+        df_status[status_cols].to_dict('records'),
+        [fixture_index.congestion(selected_team)],
+        status_summary(selected_team, df_status),
+        version
     )
 
-    # Summary text
-    summary_text = html.P(
-        f"{selected_team} has {df_team['Available'].values[0]} available players, "
-        f"{df_team['Doubtful'].values[0]} doubtful, and {df_team['Injured'].values[0]} injured.",
-        style={"textAlign": "center", "fontWeight": "bold", "marginTop": "20px"}
-    )
 
-    return [
-        dcc.Graph(figure=fig),
-        status_table,
-        summary_text
-    ]
+@callback(
+    Output('team-status-table', 'data', allow_duplicate=True),
+    Output('team-status-summary', 'children', allow_duplicate=True),
+    Output('team-status-version', 'data', allow_duplicate=True),
+    Input('team-status-refresh', 'n_intervals'),
+    State('team-status-version', 'data'),
+    State('team-dropdown', 'value'),
+    prevent_initial_call=True
+)
+def push_team_status_changes(_, client_version, selected_team):
+    status_feed.maybe_refresh()
+
+    version = status_feed.version
+    changes = status_feed.changes_since(client_version)
+    if changes is not None and selected_team not in changes['changed'] and selected_team not in changes['added']:
+        return no_update, no_update, version
+
+    current_status = status_feed.current
+    df_status = current_status[current_status['team'] == selected_team]
+    summary = status_summary(selected_team, df_status)
+
+    # Client missed too many versions or the team just appeared: resend its row
+    if changes is None or selected_team in changes['added']:
+        return df_status[status_cols].to_dict('records'), summary, version
+
+    patch = Patch()
+    for col, value in changes['changed'][selected_team].items():
+        patch[0][col] = value
+    return patch, summary, version
+
+
+
+@callback(
+    Output('injury-history-output', 'children'),
+    Input('injury-season-dropdown', 'value'),
+    prevent_initial_call=True
+)
+def update_injury_history(season):
+    return injury_history_components(*process_injury_data(injury_records(season)))
+
+
+@get_app().server.route("/export/team-results.<fmt>")
+def export_team_results(fmt):
+    """Stream team_results as CSV or Arrow, e.g. /export/team-results.arrow?team=Arsenal&team=Spurs"""
+    selected_teams = request.args.getlist("team")
+    df = team_results
+    if selected_teams:
+        df = df[df["team"].isin(selected_teams)]
+    return export_response(df, fmt, "team-results")
+
+
+@callback(
+    Output('fixtures-output', 'children'),
+    Input('team-dropdown', 'value'),
+    Input('fixtures-count', 'value'),
+    Input('fixtures-date-range', 'start_date'),
+    Input('fixtures-date-range', 'end_date')
+)
+def update_upcoming_fixtures(selected_team, count, start_date, end_date):
+    if start_date and end_date:
+        fixtures = fixture_index.fixtures_between(selected_team, start_date, f"{end_date} 23:59:59")
+    else:
+        fixtures = fixture_index.next_fixtures(selected_team, count or 5)
+
+    if fixtures.empty:
+        return html.P("No fixtures scheduled.", style={"textAlign": "center"})
+
+    is_home = fixtures['team_h'] == selected_team
+    rows = pd.DataFrame({
+        "Kickoff": pd.to_datetime(fixtures['kickoff_time'], utc=True).dt.strftime("%Y-%m-%d %H:%M"),
+        "Gameweek": fixtures['event'],
+        "Opponent": fixtures['team_a'].where(is_home, fixtures['team_h']),
+        "Venue": is_home.map({True: "Home", False: "Away"}),
+    })
+
+    return dash_table.DataTable(
+        data=rows.to_dict('records'),
+        columns=[{"name": col, "id": col} for col in rows.columns],
+        style_table={'margin': '20px auto', 'maxWidth': '700px'},
+        style_cell={'padding': '8px', 'textAlign': 'left'},
+        style_header={'fontWeight': 'bold', 'backgroundColor': '#f0f0f0'}
+    )
@@ -0,0 +1,112 @@
+import heapq
+from collections import defaultdict
+
+from injury_matching import normalize_name
+
+
+class PlayerSearchIndex:
+    """
+    Prefix/trigram index for search-as-you-type over players.
+
+    Queries shorter than three characters go through the token prefix map,
+    longer ones intersect trigram postings; either way only the surviving
+    candidates are checked against the filters and ranked.
+    """
+
+    def __init__(self, players_df, limit=20):
+        self.limit = limit
+        self.ids = [int(i) for i in players_df["id"]]
+        self.teams = players_df["team"].tolist()
+        self.positions = players_df["position"].tolist()
+        self.ages = players_df["age"].tolist()
+        self.labels = [
+            f"{web} ({team} - {pos})"
+            for web, team, pos in zip(players_df["web_name"], self.teams, self.positions)
+        ]
+        self.web_names = [normalize_name(w) for w in players_df["web_name"]]
+        self.search_text = [
+            " ".join(normalize_name(v) for v in fields)
+            for fields in zip(
+                players_df["web_name"], players_df["first_name"],
+                players_df["second_name"], self.teams
+            )
+        ]
+
+        # Most-played first when nothing has been typed or scores tie
+        minutes = players_df["minutes"].tolist()
+        self.rank = [0] * len(self.ids)
+        for r, pos in enumerate(sorted(range(len(self.ids)), key=lambda p: -minutes[p])):
+            self.rank[pos] = r
+        self.by_rank = sorted(range(len(self.ids)), key=lambda p: self.rank[p])
+        self.position_of = {player_id: pos for pos, player_id in enumerate(self.ids)}
+
+        self.prefixes = defaultdict(set)
+        self.trigrams = defaultdict(set)
+        for pos, text in enumerate(self.search_text):
+            for token in text.split():
+                self.prefixes[token[:1]].add(pos)
+                self.prefixes[token[:2]].add(pos)
+            for i in range(len(text) - 2):
+                self.trigrams[text[i:i + 3]].add(pos)
+
+    def _candidates(self, query):
+        if len(query) < 3:
+            return self.prefixes.get(query, set())
+
+        grams = [query[i:i + 3] for i in range(len(query) - 2)]
+        postings = sorted((self.trigrams.get(g, set()) for g in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return {pos for pos in candidates if query in self.search_text[pos]}
+
+    def _accept(self, pos, teams, positions, age_range):
+        if teams and self.teams[pos] not in teams:
+            return False
+        if positions and self.positions[pos] not in positions:
+            return False
+        if age_range and len(age_range) == 2:
+            return age_range[0] <= self.ages[pos] <= age_range[1]
+        return True
+
+    def _score(self, pos, query):
+        if self.web_names[pos].startswith(query):
+            return 0
+        if any(token.startswith(query) for token in self.search_text[pos].split()):
+            return 1
+        return 2
+
+    def search(self, query, teams=None, positions=None, age_range=None, limit=None):
+        """Return the positions of the top matches for `query` under the filters."""
+        limit = limit or self.limit
+        query = normalize_name(query)
+
+        if not query:
+            matches = []
+            for pos in self.by_rank:
+                if self._accept(pos, teams, positions, age_range):
+                    matches.append(pos)
+                    if len(matches) == limit:
+                        break
+            return matches
+
+        candidates = [
+            pos for pos in self._candidates(query)
+            if self._accept(pos, teams, positions, age_range)
+        ]
+        return heapq.nsmallest(
+            limit, candidates, key=lambda pos: (self._score(pos, query), self.rank[pos])
+        )
+
+    def options(self, positions):
+        # `search` keeps the client-side filter from hiding first-name matches
+        return [
+            {"label": self.labels[pos], "value": self.ids[pos], "search": self.search_text[pos]}
+            for pos in positions
+        ]
+
+    def option_for(self, player_id):
+        pos = self.position_of.get(player_id)
+        return None if pos is None else self.options([pos])[0]
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+
+SIMILARITY_STATS = [
+    "goals_scored", "assists",
+    "expected_goals", "expected_assists", "expected_goal_involvements",
+    "saves", "yellow_cards", "red_cards",
+]
+
+
+class SimilarPlayerIndex:
+    """
+    Unit-length per-90 stat vectors, z-scored within each position.
+
+    Built once per snapshot; a query is one matrix-vector product against
+    the player's position block followed by an argpartition for the top k.
+    """
+
+    def __init__(self, players_df, min_minutes=270):
+        minutes = pd.to_numeric(players_df["minutes"], errors="coerce").fillna(0).to_numpy(float)
+        eligible = minutes >= min_minutes
+
+        # FPL sends the expected_* stats as strings
+        stats = (
+            players_df[SIMILARITY_STATS]
+            .apply(pd.to_numeric, errors="coerce")
+            .fillna(0)
+            .to_numpy(float)
+        )
+        per_90 = stats / np.maximum(minutes, 1)[:, None] * 90
+
+        self.ids = players_df["id"].to_numpy()[eligible]
+        self.labels = (players_df["web_name"] + " (" + players_df["team"] + ")").to_numpy()[eligible]
+        positions = players_df["position"].to_numpy()[eligible]
+        per_90 = per_90[eligible]
+
+        self.vectors = np.zeros_like(per_90)
+        self.position_rows = {}
+        for position in pd.unique(positions):
+            rows = np.flatnonzero(positions == position)
+            block = per_90[rows]
+            std = block.std(axis=0)
+            std[std == 0] = 1
+            self.vectors[rows] = (block - block.mean(axis=0)) / std
+            self.position_rows[position] = rows
+
+        norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        self.vectors /= norms
+
+        self.positions = positions
+        self.row_of = {int(player_id): row for row, player_id in enumerate(self.ids)}
+
+    def similar(self, player_id, k=5):
+        """
+        [(player_id, label, cosine similarity), ...] for the k closest players in the same position.
+
+        Players pointing the other way (similarity <= 0) are not similar at all and are left out.
+        """
+        row = self.row_of.get(int(player_id))
+        if row is None:
+            return []
+
+        rows = self.position_rows[self.positions[row]]
+        scores = self.vectors[rows] @ self.vectors[row]
+        scores[rows == row] = -np.inf
+
+        k = min(k, len(rows) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (int(self.ids[rows[i]]), self.labels[rows[i]], float(scores[i]))
+            for i in top
+            if scores[i] > 0
+        ]
@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+
+def _json_value(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+        if isinstance(value, float) and pd.isna(value):
+            return None
+    return value
+
+
+def diff_snapshots(old_df, new_df, key, columns):
+    """
+    Compare two snapshots row by row on `key`.
+
+    Returns {"changed": {key: {column: new_value}}, "added": [...], "removed": [...]}
+    where only the columns whose value actually moved are listed per key.
+    """
+    old = old_df.drop_duplicates(key).set_index(key)
+    new = new_df.drop_duplicates(key).set_index(key)
+
+    added = new.index.difference(old.index)
+    removed = old.index.difference(new.index)
+    common = old.index.intersection(new.index)
+
+    old_common = old.loc[common, columns]
+    new_common = new.loc[common, columns]
+    moved = (old_common != new_common) & ~(old_common.isna() & new_common.isna())
+
+    changed = {}
+    for column in columns:
+        for k in moved.index[moved[column].to_numpy()]:
+            changed.setdefault(_json_value(k), {})[column] = _json_value(new_common.at[k, column])
+
+    return {
+        "changed": changed,
+        "added": [_json_value(k) for k in added],
+        "removed": [_json_value(k) for k in removed],
+    }
+
+
+def is_empty_diff(changes):
+    return not (changes["changed"] or changes["added"] or changes["removed"])
+
+
+def snapshot_version(df, key, columns):
+    """Content hash of the tracked columns, identical in every worker holding the same snapshot."""
+    hashes = pd.util.hash_pandas_object(df[[key] + columns].astype(str), index=False)
+    return hashlib.sha1(hashes.to_numpy().tobytes()).hexdigest()[:16]
+
+
+class SnapshotFeed:
+    """
+    Holds the latest snapshot plus a short history of change sets.
+
+    `version` is a hash of the snapshot content rather than a counter, so
+    it means the same thing in every worker process. A client that
+    remembers the version it rendered can ask for just the deltas since
+    then; a version this process never held means a full reload.
+    """
+
+    def __init__(self, loader, key, columns, initial=None, refresh_seconds=300, history=50):
+        self.loader = loader
+        self.key = key
+        self.columns = columns
+        self.refresh_seconds = refresh_seconds
+        self.current = initial if initial is not None else loader()
+        self.version = snapshot_version(self.current, key, columns)
+        self.loaded_at = time.time()
+        self.history = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def maybe_refresh(self):
+        """Reload the snapshot if it is stale. Returns True if anything changed."""
+        if time.time() - self.loaded_at < self.refresh_seconds:
+            return False
+        # Another request is already refreshing
+        if not self._lock.acquire(blocking=False):
+            return False
+
+        try:
+            new = self.loader()
+            changes = diff_snapshots(self.current, new, self.key, self.columns)
+            new_version = snapshot_version(new, self.key, self.columns)
+            if new_version == self.version:
+                self.current = new
+                return False
+            # Deltas are applied by row position, so any reorder means clients must reload
+            reordered = self.current[self.key].tolist() != new[self.key].tolist()
+            self.history.append((self.version, new_version, None if reordered else changes))
+            self.current = new
+            self.version = new_version
+            return True
+        except Exception as e:
+            print(f"Error refreshing snapshot: {e}")
+            return False
+        finally:
+            self.loaded_at = time.time()
+            self._lock.release()
+
+    def changes_since(self, version):
+        """
+        Merge every change set after `version`.
+
+        Returns None when the client is too far behind, never loaded, or
+        rendered a snapshot from another worker, and has to reload the full
+        table instead.
+        """
+        if version == self.version:
+            return {"changed": {}, "added": [], "removed": []}
+
+        history = list(self.history)
+        starts = [i for i, (old_version, _, _) in enumerate(history) if old_version == version]
+        if not starts:
+            return None
+
+        merged = {"changed": {}, "added": [], "removed": []}
+        for _, _, changes in history[starts[-1]:]:
+            if changes is None:
+                return None
+            for k, fields in changes["changed"].items():
+                merged["changed"].setdefault(k, {}).update(fields)
+            merged["added"].extend(changes["added"])
+            merged["removed"].extend(changes["removed"])
+        return merged
@@ -0,0 +1,142 @@
+import builtins
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+PROFILE_OUTPUT_FILE = "startup-profile.json"
+# Standard library imports are cheap and would drown out the third-party packages
+STDLIB_MODULES = getattr(sys, "stdlib_module_names", frozenset())
+
+
+class StartupProfiler:
+    """
+    Times startup stages, top-level imports and bytes downloaded per endpoint.
+
+    Enabled with `python app.py --profile-startup` or PROFILE_STARTUP=1;
+    when disabled every hook is a no-op. Stage and import times are
+    inclusive, so "register pages" contains the network and pandas stages
+    run by the page modules it imports, and "dash" contains "plotly".
+    """
+
+    def __init__(self):
+        self.enabled = "--profile-startup" in sys.argv or os.getenv("PROFILE_STARTUP") == "1"
+        self.output_file = os.getenv("PROFILE_STARTUP_OUTPUT", PROFILE_OUTPUT_FILE)
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.imports = {}
+        self.downloads = {}
+        self._original_import = None
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += time.perf_counter() - start
+            entry["calls"] += 1
+
+    @staticmethod
+    def endpoint(url):
+        # /api/event/12/live/ and /api/event/13/live/ are the same endpoint
+        parsed = urlparse(url)
+        return parsed.netloc + re.sub(r"/\d+(?=/|$)", "/{id}", parsed.path)
+
+    def record_download(self, url, num_bytes):
+        if not self.enabled:
+            return
+        entry = self.downloads.setdefault(self.endpoint(url), {"bytes": 0, "calls": 0})
+        entry["bytes"] += num_bytes
+        entry["calls"] += 1
+
+    def install_import_timer(self):
+        """Time the first import of every top-level package (dash, plotly, pandas, ...), however deep."""
+        if not self.enabled or self._original_import is not None:
+            return
+
+        original_import = builtins.__import__
+        self._original_import = original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            root = name.split(".")[0]
+            if level or root in sys.modules or root in STDLIB_MODULES or root.startswith("_"):
+                return original_import(name, globals, locals, fromlist, level)
+
+            start = time.perf_counter()
+            module = original_import(name, globals, locals, fromlist, level)
+            # Another thread may have been waiting on the same import lock
+            self.imports.setdefault(root, time.perf_counter() - start)
+            return module
+
+        builtins.__import__ = timed_import
+
+    def remove_import_timer(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _load_previous(self):
+        if not os.path.exists(self.output_file):
+            return {}
+        try:
+            with open(self.output_file, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error reading {self.output_file}: {e}")
+            return {}
+
+    def report(self):
+        """Print the sorted report (with deltas against the last run) and save it as JSON."""
+        if not self.enabled:
+            return None
+
+        self.remove_import_timer()
+        previous = self._load_previous()
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_seconds": time.perf_counter() - self.started,
+            "stages": self.stages,
+            "imports": {name: {"seconds": s} for name, s in self.imports.items()},
+            "downloads": self.downloads,
+        }
+
+        def delta(section, name, value, field):
+            old = previous.get(section, {}).get(name, {}).get(field)
+            return "" if old is None else f" ({value - old:+.3f})"
+
+        total_delta = ""
+        if "total_seconds" in previous:
+            total_delta = f" ({report['total_seconds'] - previous['total_seconds']:+.3f})"
+        print(f"\nStartup profile: {report['total_seconds']:.3f}s total{total_delta}")
+        for section, rows in (("stages", report["stages"]), ("imports", report["imports"])):
+            # Times are inclusive; nested stages and packages are counted in their parents too
+            print(f"\n{section.title()} (inclusive):")
+            for name, entry in sorted(rows.items(), key=lambda item: -item[1]["seconds"]):
+                calls = f" x{entry['calls']}" if entry.get("calls", 1) > 1 else ""
+                print(f"  {entry['seconds']:8.3f}s{delta(section, name, entry['seconds'], 'seconds')}  {name}{calls}")
+
+        print("\nDownloads:")
+        for name, entry in sorted(report["downloads"].items(), key=lambda item: -item[1]["bytes"]):
+            print(f"  {entry['bytes'] / 1024:10.1f} KB  {name} x{entry['calls']}")
+
+        try:
+            with open(self.output_file, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"\nSaved startup profile to {self.output_file}")
+        except Exception as e:
+            print(f"Error writing {self.output_file}: {e}")
+
+        return report
+
+
+profiler = StartupProfiler()